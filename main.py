@@ -1,8 +1,13 @@
 """Main entry point for PO3 file generation."""
 
-import datetime
+import itertools
 import os
+import shelve
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable
 
 # Set UTF-8 encoding for console output on Windows
 if sys.platform == "win32":
@@ -12,54 +17,138 @@ import pandas as pd
 
 from src.integrations import EmailAttachment, GmailClient, GoogleDriveClient
 from src.po3 import (
-    COL_PAID,
+    COL_INVOICE_URL,
+    COL_RECEIPT_URL,
     Config,
+    PaymentSheet,
     generate_end_line,
-    generate_lines_for_expense,
-    generate_lines_for_invoice,
+    generate_lines_for_expenses,
+    generate_lines_for_invoices,
     generate_start_line,
     load_data_from_csv,
     load_data_from_gsheets,
-    validate_expense,
-    validate_invoice,
+    mark_rows_as_paid,
+    normalize_dataframes,
+    payable_mask,
+    payment_date,
+    validate_expense_dataframe,
+    validate_invoice_dataframe,
 )
 
 
-def write_po3_file(file_name: str, lines: list[str]) -> None:
+def write_po3_file(file_name: str, lines: Iterable[str]) -> Path:
     """
     Write PO3 file with proper encoding.
 
     Args:
         file_name: Output file name
-        lines: List of formatted lines
+        lines: Formatted lines, in file order
+
+    Returns:
+        Path of the written file
     """
     # Ensure output directory exists
-    os.makedirs("output", exist_ok=True)
-    file_path = os.path.join("output", file_name)
-
-    with open(file_path, "w", encoding="utf-8") as f:
-        f.write("\n".join(lines))
+    output_dir = Path("output")
+    output_dir.mkdir(exist_ok=True)
+    file_path = output_dir / file_name
+
+    # Stream encoded lines through one large buffer into a temporary file, then
+    # move it into place so a failed run never leaves a truncated PO3 file behind.
+    # Binary mode skips the text layer; lines are still separated by the
+    # platform line ending, as text mode wrote them.
+    tmp_path = file_path.with_name(file_name + ".tmp")
+    separator = os.linesep.encode("utf-8")
+    line_iter = iter(lines)
+    try:
+        with open(tmp_path, "wb", buffering=1 << 20) as f:
+            f.write(next(line_iter, "").encode("utf-8"))
+            f.writelines(separator + line.encode("utf-8") for line in line_iter)
+        tmp_path.replace(file_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
 
     return file_path
 
 
-def _send_drive_attachment(
+def _forward_drive_attachments(
     gmail_client: GmailClient,
     drive_client: GoogleDriveClient,
     recipient: str,
-    subject: str,
-    body: str,
-    drive_url: str,
-) -> dict:
-    """Download a Drive file and send it as a Gmail attachment."""
-    content, filename = drive_client.download_file_from_url(drive_url)
-    attachment = EmailAttachment(filename=filename, content=content)
-    return gmail_client.send_message(
-        to=recipient,
-        subject=subject,
-        body=body,
-        attachments=[attachment],
-    )
+    messages: list[tuple[str, str, str, int]],
+    max_workers: int,
+    sent_log_path: str | None = None,
+) -> None:
+    """
+    Download Drive files and send each as a Gmail attachment, several at a time.
+
+    Args:
+        gmail_client: Client used to send the messages
+        drive_client: Client used to download the files
+        recipient: Email address of the recipient
+        messages: List of (subject, body, drive_url, amount) tuples, amount in öre
+        max_workers: Maximum number of attachments forwarded concurrently
+        sent_log_path: Optional shelve file recording sent messages, so a
+            rerun after a partial failure skips what was already forwarded
+    """
+    if not messages:
+        return
+
+    sent = shelve.open(sent_log_path) if sent_log_path else {}
+    sent_lock = threading.Lock()
+    try:
+        pending = [
+            message for message in messages
+            if _sent_log_key(recipient, message) not in sent
+        ]
+        if len(pending) < len(messages):
+            skipped = len(messages) - len(pending)
+            print(f"Skipping {skipped} attachments forwarded in an earlier run.")
+        if not pending:
+            return
+
+        # Rows sharing a Drive file reuse one download
+        messages_by_url: dict[str, list[tuple[str, str, str, int]]] = {}
+        for message in pending:
+            messages_by_url.setdefault(message[2], []).append(message)
+
+        # Resolve all file names in batched metadata requests; media downloads
+        # cannot be batched, so those run in parallel instead
+        file_names = drive_client.get_file_names([
+            file_id
+            for file_id in map(drive_client.extract_file_id, messages_by_url)
+            if file_id
+        ])
+
+        def forward(url_messages: list[tuple[str, str, str, int]]) -> None:
+            drive_url = url_messages[0][2]
+            content, filename = drive_client.download_file_from_url(
+                drive_url, file_names.get(drive_client.extract_file_id(drive_url))
+            )
+            attachment = EmailAttachment(filename=filename, content=content)
+            for message in url_messages:
+                subject, body, _, _ = message
+                response = gmail_client.send_message(
+                    to=recipient,
+                    subject=subject,
+                    body=body,
+                    attachments=[attachment],
+                )
+                with sent_lock:
+                    sent[_sent_log_key(recipient, message)] = response.get("id", "")
+
+        # Each worker sends its messages as soon as its download finishes
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for _ in executor.map(forward, messages_by_url.values()):
+                pass
+    finally:
+        if sent_log_path:
+            sent.close()
+
+
+def _sent_log_key(recipient: str, message: tuple[str, str, str, int]) -> str:
+    """Key a forwarded message by recipient, subject, Drive URL and amount."""
+    subject, _, drive_url, amount = message
+    return "\x1f".join((recipient, subject, drive_url, str(amount)))
 
 
 def _has_attachment_urls(frame: pd.DataFrame, column_name: str) -> bool:
@@ -73,84 +162,89 @@ def process_payments(
     expenses: pd.DataFrame,
     invoices: pd.DataFrame,
     config: Config,
-    ws_expenses=None,
-    ws_invoices=None,
+    today: str,
+    ws_expenses: PaymentSheet | None = None,
+    ws_invoices: PaymentSheet | None = None,
     gmail_client: GmailClient | None = None,
     drive_client: GoogleDriveClient | None = None,
-) -> tuple[list[str], int, float]:
+) -> tuple[list[str], int, int]:
     """
-    Process all unpaid expenses and invoices.
+    Process approved, unpaid expenses and invoices.
 
     Args:
-        expenses: DataFrame with expenses
-        invoices: DataFrame with invoices
+        expenses: DataFrame with approved, unpaid expenses
+        invoices: DataFrame with approved, unpaid invoices
         config: Configuration object
-        ws_expenses: Optional Google Sheets worksheet for expenses
-        ws_invoices: Optional Google Sheets worksheet for invoices
+        today: Payment date as YYYYMMDD
+        ws_expenses: Optional Google Sheets sheet for expenses
+        ws_invoices: Optional Google Sheets sheet for invoices
 
     Returns:
-        Tuple of (output_lines, number_of_rows, total_cost)
+        Tuple of (output_lines, number_of_rows, total_cost), total_cost in öre
     """
-    output_lines = []
-    number_of_rows = 0
-    total_cost = 0.0
+    valid_expenses = []
+    valid_invoices = []
+    paid_expense_rows = []
+    paid_invoice_rows = []
+    attachment_messages = []
+    total_cost = 0
 
     # Process expenses
-    for index, row in expenses[~expenses[COL_PAID]].iterrows():
-        expense = validate_expense(row)
-        if expense:
-            output_lines.extend(generate_lines_for_expense(expense))
-            total_cost += expense.Belopp
-            number_of_rows += 1
-
-            if gmail_client and drive_client and expense.kvitto_url:
-                _send_drive_attachment(
-                    gmail_client,
-                    drive_client,
-                    config.attachment_email_recipient,
-                    f"PO3 kvitto: {expense.Ditt_namn}",
-                    (
-                        f"Automatisk vidarebefordran av kvitto för {expense.Ditt_namn} "
-                        f"({expense.Verksamhet})"
-                    ),
-                    expense.kvitto_url,
-                )
-
-            if config.use_gsheets and ws_expenses:
-                ws_expenses.update_cell(
-                    index + 2,
-                    expenses.columns.get_loc(COL_PAID) + 1,
-                    True
-                )
+    for index, expense in validate_expense_dataframe(expenses):
+        valid_expenses.append(expense)
+        paid_expense_rows.append(index)
+        total_cost += expense.Belopp
+
+        if expense.kvitto_url:
+            attachment_messages.append((
+                f"PO3 kvitto: {expense.Ditt_namn}",
+                (
+                    f"Automatisk vidarebefordran av kvitto för {expense.Ditt_namn} "
+                    f"({expense.Verksamhet})"
+                ),
+                expense.kvitto_url,
+                expense.Belopp,
+            ))
 
     # Process invoices
-    for index, row in invoices[~invoices[COL_PAID]].iterrows():
-        invoice = validate_invoice(row)
-        if invoice:
-            output_lines.extend(generate_lines_for_invoice(invoice))
-            total_cost += invoice.Belopp
-            number_of_rows += 1
-
-            if gmail_client and drive_client and invoice.faktura_url:
-                _send_drive_attachment(
-                    gmail_client,
-                    drive_client,
-                    config.attachment_email_recipient,
-                    f"PO3 faktura: {invoice.Mottagare_namn}",
-                    (
-                        f"Automatisk vidarebefordran av faktura för {invoice.Mottagare_namn} "
-                        f"({invoice.Verksamhet})"
-                    ),
-                    invoice.faktura_url,
-                )
+    for index, invoice in validate_invoice_dataframe(invoices):
+        valid_invoices.append(invoice)
+        paid_invoice_rows.append(index)
+        total_cost += invoice.Belopp
+
+        if invoice.faktura_url:
+            attachment_messages.append((
+                f"PO3 faktura: {invoice.Mottagare_namn}",
+                (
+                    f"Automatisk vidarebefordran av faktura för {invoice.Mottagare_namn} "
+                    f"({invoice.Verksamhet})"
+                ),
+                invoice.faktura_url,
+                invoice.Belopp,
+            ))
+
+    # Forward receipts and invoices found in processed rows
+    if gmail_client and drive_client:
+        _forward_drive_attachments(
+            gmail_client,
+            drive_client,
+            config.attachment_email_recipient,
+            attachment_messages,
+            config.drive_download_concurrency,
+            config.forwarded_attachments_log,
+        )
 
-            if config.use_gsheets and ws_invoices:
-                ws_invoices.update_cell(
-                    index + 2,
-                    invoices.columns.get_loc(COL_PAID) + 1,
-                    True
-                )
+    # Mark processed rows as paid in both worksheets with one request
+    if config.use_gsheets:
+        mark_rows_as_paid(
+            (sheet, rows)
+            for sheet, rows in ((ws_expenses, paid_expense_rows), (ws_invoices, paid_invoice_rows))
+            if sheet
+        )
 
+    output_lines = generate_lines_for_expenses(valid_expenses, today)
+    output_lines.extend(generate_lines_for_invoices(valid_invoices, today))
+    number_of_rows = len(valid_expenses) + len(valid_invoices)
     return output_lines, number_of_rows, total_cost
 
 
@@ -158,6 +252,7 @@ def main():
     """Main entry point for PO3 file generation."""
     try:
         config = Config()
+        today = payment_date()
 
         # Load data
         if config.use_gsheets:
@@ -166,16 +261,19 @@ def main():
             expenses, invoices = load_data_from_csv(config)
             ws_expenses = ws_invoices = None
 
-        # Convert string boolean columns to actual booleans for DataFrame filtering
-        def parse_bool_col(series):
-            return series.map(lambda x: str(x).strip().lower() == "true" if isinstance(x, str) else bool(x))
+        # Convert paid flags to booleans and amounts to öre
+        expenses, invoices = normalize_dataframes(expenses, invoices)
 
-        expenses[COL_PAID] = parse_bool_col(expenses[COL_PAID])
-        invoices[COL_PAID] = parse_bool_col(invoices[COL_PAID])
+        # Keep only approved, unpaid rows; skip client setup when there are none
+        expenses = expenses[payable_mask(expenses)]
+        invoices = invoices[payable_mask(invoices)]
+        if expenses.empty and invoices.empty:
+            print("No new expenses to process.")
+            return
 
         gmail_client = GmailClient() if (
-            _has_attachment_urls(expenses, "Ladda upp bild på kvitto")
-            or _has_attachment_urls(invoices, "Ladda upp fakturan")
+            _has_attachment_urls(expenses, COL_RECEIPT_URL)
+            or _has_attachment_urls(invoices, COL_INVOICE_URL)
         ) else None
         drive_client = GoogleDriveClient() if gmail_client else None
 
@@ -184,6 +282,7 @@ def main():
             expenses,
             invoices,
             config,
+            today,
             ws_expenses,
             ws_invoices,
             gmail_client,
@@ -195,16 +294,19 @@ def main():
             print("No new expenses to process.")
             return
 
-        # Add header and trailer
-        output_lines.insert(0, generate_start_line(config.org_number, config.account_number))
-        output_lines.append(generate_end_line(number_of_rows, total_cost))
+        # Add header and trailer without copying the payment lines
+        file_lines = itertools.chain(
+            [generate_start_line(config.org_number, config.account_number)],
+            output_lines,
+            [generate_end_line(number_of_rows, total_cost)],
+        )
 
         # Write file
-        file_name = f"utlägg_{datetime.datetime.now().strftime('%Y%m%d')}_po3.txt"
-        file_path = write_po3_file(file_name, output_lines)
+        file_name = f"utlägg_{today}_po3.txt"
+        file_path = write_po3_file(file_name, file_lines)
 
         print(f"✓ {number_of_rows} payments written to: {file_path}")
-        print(f"✓ Total amount: {total_cost:.2f} SEK")
+        print(f"✓ Total amount: {total_cost / 100:.2f} SEK")
 
     except Exception as e:
         print(f"Error: {e}")
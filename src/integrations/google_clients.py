@@ -1,17 +1,48 @@
-import base64
+import functools
 import mimetypes
 import os
+import re
+import threading
 from dataclasses import dataclass
 from email.message import EmailMessage
 from io import BytesIO
 from pathlib import Path
 from typing import Optional, Sequence
 
+import google_auth_httplib2
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseDownload
+from googleapiclient.http import (
+    HttpRequest,
+    MediaIoBaseDownload,
+    MediaIoBaseUpload,
+    build_http,
+)
+
+# Drive file IDs in "?id=<ID>" query strings and ".../d/<ID>/..." paths
+_FILE_ID_QUERY_RE = re.compile(r"id=([^&]*)")
+_FILE_ID_PATH_RE = re.compile(r"/d/([^/]*)")
+
+# Maximum number of calls Drive accepts in one batch request
+DRIVE_BATCH_LIMIT = 100
+
+# Content types of the usual receipt and invoice uploads, checked before mimetypes
+_ATTACHMENT_MIME_TYPES = {
+    ".pdf": "application/pdf",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".tif": "image/tiff",
+    ".tiff": "image/tiff",
+}
+
+
+@functools.lru_cache(maxsize=4096)
+def _extract_file_id_cached(url: str) -> Optional[str]:
+    """Return the Drive file ID in a sharing URL, memoized since rows repeat links."""
+    match = _FILE_ID_QUERY_RE.search(url) or _FILE_ID_PATH_RE.search(url)
+    return match.group(1) if match else None
 
 
 class GoogleAuthClient:
@@ -29,22 +60,52 @@ class GoogleAuthClient:
             raise NotImplementedError("Subclasses must define SCOPES and TOKEN_FILE")
 
         creds = None
-        if os.path.exists(self.TOKEN_FILE):
+        try:
             creds = Credentials.from_authorized_user_file(self.TOKEN_FILE, self.SCOPES)
+        except FileNotFoundError:
+            pass
 
         if not creds or not creds.valid:
             if creds and creds.expired and creds.refresh_token:
                 creds.refresh(Request())
             else:
+                # Only a first-time login needs the OAuth flow and its browser support
+                from google_auth_oauthlib.flow import InstalledAppFlow
+
                 flow = InstalledAppFlow.from_client_secrets_file(
                     "google_client_secret.json", self.SCOPES
                 )
                 creds = flow.run_local_server(port=0)
-            with open(self.TOKEN_FILE, "w") as token:
-                token.write(creds.to_json())
+            # Write atomically so a crash cannot leave a truncated token behind
+            token_path = Path(self.TOKEN_FILE)
+            tmp_path = token_path.with_name(token_path.name + ".tmp")
+            tmp_path.write_text(creds.to_json(), encoding="utf-8")
+            tmp_path.replace(token_path)
 
         # Correctly maps to the subclass attributes
-        self.service = build(self.service_name, self.service_version, credentials=creds)
+        self.credentials = creds
+        self._local = threading.local()
+        self.service = build(
+            self.service_name,
+            self.service_version,
+            http=self._authorized_http(),
+            requestBuilder=self._build_request,
+        )
+
+    def _authorized_http(self) -> google_auth_httplib2.AuthorizedHttp:
+        """Create an HTTP client that signs requests with the OAuth credentials."""
+        return google_auth_httplib2.AuthorizedHttp(self.credentials, http=build_http())
+
+    def _thread_http(self) -> google_auth_httplib2.AuthorizedHttp:
+        """Return the calling thread's HTTP client, keeping its connections alive."""
+        http = getattr(self._local, "http", None)
+        if http is None:
+            http = self._local.http = self._authorized_http()
+        return http
+
+    def _build_request(self, _http, *args, **kwargs) -> HttpRequest:
+        """Bind each request to its thread's HTTP client, since httplib2 is not thread-safe."""
+        return HttpRequest(self._thread_http(), *args, **kwargs)
 
 
 class GoogleDriveClient(GoogleAuthClient):
@@ -57,21 +118,40 @@ class GoogleDriveClient(GoogleAuthClient):
 
     @staticmethod
     def extract_file_id(url: str) -> Optional[str]:
-        if not url:
+        if not url or not isinstance(url, str):
             return None
-        if "id=" in url:
-            return url.split("id=")[1].split("&")[0]
-        if "/d/" in url:
-            return url.split("/d/")[1].split("/")[0]
-        return None
+        return _extract_file_id_cached(url)
+
+    def get_file_names(self, file_ids: Sequence[str]) -> dict[str, str]:
+        """Look up file names with batched metadata requests; failed lookups are left out."""
+        names = {}
+
+        def store_name(request_id, response, exception):
+            if exception is None and response.get("name"):
+                names[request_id] = response["name"]
+
+        # Request IDs must be unique within a batch
+        unique_ids = list(dict.fromkeys(file_ids))
+        for start in range(0, len(unique_ids), DRIVE_BATCH_LIMIT):
+            batch = self.service.new_batch_http_request(callback=store_name)
+            for file_id in unique_ids[start:start + DRIVE_BATCH_LIMIT]:
+                batch.add(
+                    self.service.files().get(fileId=file_id, fields="name"),
+                    request_id=file_id,
+                )
+            batch.execute()
+        return names
 
-    def download_file(self, file_id: str) -> tuple[bytes, str]:
+    def download_file(self, file_id: str, filename: Optional[str] = None) -> tuple[bytes, str]:
         try:
-            file_metadata = self.service.files().get(
-                fileId=file_id, fields="name, mimeType"
-            ).execute()
-
-            file_name = file_metadata.get("name", f"file_{file_id}")
+            # The metadata lookup only fetches the name, so skip it when the caller has one
+            if filename:
+                file_name = filename
+            else:
+                file_metadata = self.service.files().get(
+                    fileId=file_id, fields="name"
+                ).execute()
+                file_name = file_metadata.get("name", f"file_{file_id}")
 
             request = self.service.files().get_media(fileId=file_id)
             file_stream = BytesIO()
@@ -86,11 +166,11 @@ class GoogleDriveClient(GoogleAuthClient):
         except Exception as e:
             raise Exception(f"Failed to download file from Google Drive: {e}")
 
-    def download_file_from_url(self, url: str) -> tuple[bytes, str]:
+    def download_file_from_url(self, url: str, filename: Optional[str] = None) -> tuple[bytes, str]:
         file_id = self.extract_file_id(url)
         if not file_id:
             raise ValueError(f"Could not extract file ID from URL: {url}")
-        return self.download_file(file_id)
+        return self.download_file(file_id, filename)
 
 
 @dataclass(frozen=True)
@@ -112,7 +192,9 @@ class GmailClient(GoogleAuthClient):
 
     @staticmethod
     def _guess_mime_type(filename: str) -> str:
-        mime_type, _ = mimetypes.guess_type(filename)
+        mime_type = _ATTACHMENT_MIME_TYPES.get(os.path.splitext(filename)[1].lower())
+        if mime_type is None:
+            mime_type, _ = mimetypes.guess_type(filename)
         return mime_type or "application/octet-stream"
 
     @staticmethod
@@ -192,10 +274,13 @@ class GmailClient(GoogleAuthClient):
     ) -> dict:
         """Send an email message through Gmail."""
         message = self._build_message(to, subject, body, attachments, sender, cc, bcc)
-        encoded_message = base64.urlsafe_b64encode(message.as_bytes()).decode()
+
+        # Upload the MIME message as media instead of a base64 "raw" JSON field,
+        # so the attachments are not copied into a base64 string and a JSON body
+        media = MediaIoBaseUpload(BytesIO(message.as_bytes()), mimetype="message/rfc822")
         return (
             self.service.users()
             .messages()
-            .send(userId="me", body={"raw": encoded_message})
+            .send(userId="me", media_body=media)
             .execute()
         )
@@ -2,20 +2,45 @@
 
 from .config import Config
 from .constants import *
-from .data_loader import load_data_from_csv, load_data_from_gsheets
+from .data_loader import (
+    PaymentSheet,
+    amounts_to_ore,
+    load_data_from_csv,
+    load_data_from_gsheets,
+    mark_rows_as_paid,
+    normalize_boolean_column,
+    normalize_dataframes,
+)
 from .formatters import *
 from .models import ExpenseRow, InvoiceRow
-from .payment_generator import generate_lines_for_expense, generate_lines_for_invoice
-from .validators import validate_expense, validate_invoice
+from .payment_generator import (
+    generate_lines_for_expenses,
+    generate_lines_for_invoices,
+)
+from .validators import (
+    payable_mask,
+    validate_expense,
+    validate_expense_dataframe,
+    validate_invoice,
+    validate_invoice_dataframe,
+)
 
 __all__ = [
     "Config",
+    "PaymentSheet",
+    "amounts_to_ore",
     "load_data_from_csv",
     "load_data_from_gsheets",
+    "mark_rows_as_paid",
+    "normalize_boolean_column",
+    "normalize_dataframes",
     "ExpenseRow",
     "InvoiceRow",
-    "generate_lines_for_expense",
-    "generate_lines_for_invoice",
+    "generate_lines_for_expenses",
+    "generate_lines_for_invoices",
+    "payable_mask",
     "validate_expense",
+    "validate_expense_dataframe",
     "validate_invoice",
+    "validate_invoice_dataframe",
 ]
@@ -1,15 +1,22 @@
 """Configuration management for PO3 file generation."""
 
+import functools
 import os
 
 from dotenv import load_dotenv
 
 
+@functools.cache
+def _load_env() -> None:
+    """Load .env into the environment once per process."""
+    load_dotenv()
+
+
 class Config:
     """Configuration loaded from environment variables."""
 
     def __init__(self):
-        load_dotenv()
+        _load_env()
         self.org_number = self._get_required("ORG_NUMBER")
         self.account_number = self._get_required("ACCOUNT_NUMBER")
         self.use_gsheets = os.getenv("USE_GSHEETS", "FALSE").upper() == "TRUE"
@@ -17,6 +24,8 @@ class Config:
             "ATTACHMENT_EMAIL_RECIPIENT",
             "contact@example.com",
         )
+        self.drive_download_concurrency = self._get_positive_int("DRIVE_DOWNLOAD_CONCURRENCY", 8)
+        self.forwarded_attachments_log = os.getenv("FORWARDED_ATTACHMENTS_LOG") or None
 
         if self.use_gsheets:
             self.sheet_name = self._get_required("SHEET_NAME")
@@ -33,3 +42,13 @@ class Config:
         if not value:
             raise ValueError(f"Required environment variable '{key}' not set")
         return value
+
+    @staticmethod
+    def _get_positive_int(key: str, default: int) -> int:
+        """Get optional positive integer environment variable or raise error."""
+        value = os.getenv(key)
+        if not value:
+            return default
+        if not value.strip().isdigit() or int(value) < 1:
+            raise ValueError(f"Environment variable '{key}' must be a positive integer")
+        return int(value)
@@ -21,3 +21,39 @@ COL_AMOUNT = "Belopp"
 COL_NAME = "Ditt namn"
 COL_ACTIVITY = "Verksamhet"
 COL_DESCRIPTION = "Kort beskrivning av köp"
+COL_CLEARING_NUMBER = "Clearingnummer"
+COL_ACCOUNT_NUMBER = "Kontonummer"
+COL_RECEIPT_URL = "Ladda upp bild på kvitto"
+COL_INVOICE_URL = "Ladda upp fakturan"
+COL_RECIPIENT_ACCOUNT_TYPE = "Mottagarkontotyp"
+COL_RECIPIENT_ACCOUNT_NUMBER = "Mottagarkontonummer"
+COL_OCR = "OCR/meddelande"
+COL_RECIPIENT_NAME = "Mottagare (namn)"
+COL_DUE_DATE = "Sista betalningsdatum"
+
+# Columns read for each data source
+EXPENSE_COLUMNS = [
+    COL_APPROVED,
+    COL_PAID,
+    COL_AMOUNT,
+    COL_ACTIVITY,
+    COL_CLEARING_NUMBER,
+    COL_ACCOUNT_NUMBER,
+    COL_RECEIPT_URL,
+    COL_NAME,
+    COL_DESCRIPTION,
+]
+INVOICE_COLUMNS = [
+    COL_APPROVED,
+    COL_PAID,
+    COL_AMOUNT,
+    COL_ACTIVITY,
+    COL_INVOICE_URL,
+    COL_RECIPIENT_ACCOUNT_TYPE,
+    COL_RECIPIENT_ACCOUNT_NUMBER,
+    COL_OCR,
+    COL_NAME,
+    COL_DESCRIPTION,
+    COL_RECIPIENT_NAME,
+    COL_DUE_DATE,
+]
@@ -1,11 +1,27 @@
 """Data loading from CSV and Google Sheets."""
 
+import itertools
+from dataclasses import dataclass
+from typing import Iterable
+
+import numpy as np
 import pandas as pd
 
 from .config import Config
+from .constants import COL_AMOUNT, COL_APPROVED, COL_PAID, EXPENSE_COLUMNS, INVOICE_COLUMNS
+
+
+@dataclass(frozen=True)
+class PaymentSheet:
+    """Worksheet rows were loaded from, with the sheet column of the paid flag."""
 
+    worksheet: object
+    paid_column: int
 
-def load_data_from_gsheets(config: Config) -> tuple[pd.DataFrame, pd.DataFrame, object, object]:
+
+def load_data_from_gsheets(
+    config: Config,
+) -> tuple[pd.DataFrame, pd.DataFrame, PaymentSheet, PaymentSheet]:
     """
     Load data from Google Sheets.
 
@@ -13,7 +29,7 @@ def load_data_from_gsheets(config: Config) -> tuple[pd.DataFrame, pd.DataFrame,
         config: Configuration object
 
     Returns:
-        Tuple of (expenses_df, invoices_df, expense_worksheet, invoice_worksheet)
+        Tuple of (expenses_df, invoices_df, expense_sheet, invoice_sheet)
     """
     import gspread
 
@@ -21,15 +37,147 @@ def load_data_from_gsheets(config: Config) -> tuple[pd.DataFrame, pd.DataFrame,
     sheet = gc.open(config.sheet_name)
 
     ws_expenses = sheet.get_worksheet_by_id(int(config.expense_gsheet_id))
-    expenses = pd.DataFrame(ws_expenses.get_all_records())
+    expenses, ws_expenses = _load_worksheet(ws_expenses, EXPENSE_COLUMNS)
 
     ws_invoices = sheet.get_worksheet_by_id(int(config.invoice_gsheet_id))
-    invoices = pd.DataFrame(ws_invoices.get_all_records())
+    invoices, ws_invoices = _load_worksheet(ws_invoices, INVOICE_COLUMNS)
 
     print("Data loaded from Google Sheets.")
     return expenses, invoices, ws_expenses, ws_invoices
 
 
+def _column_letter(column: int) -> str:
+    """Return the A1 letter(s) of a 1-based sheet column."""
+    from gspread.utils import rowcol_to_a1
+
+    return rowcol_to_a1(1, column)[:-1]
+
+
+def _find_payable_rows(worksheet, header: list[str]) -> list[int]:
+    """
+    Find approved, unpaid rows by reading only the two flag columns.
+
+    The Sheets API drops trailing blank cells, so rows past the end of the
+    approval column are unapproved and rows past the end of the paid column
+    are unpaid.
+
+    Args:
+        worksheet: Worksheet to inspect
+        header: Header row of the worksheet
+
+    Returns:
+        0-based data row indices (sheet row minus 2) that are payable
+    """
+    from gspread.utils import numericise_all
+
+    ranges = []
+    for column_name in (COL_APPROVED, COL_PAID):
+        letter = _column_letter(header.index(column_name) + 1)
+        ranges.append(f"{letter}2:{letter}")
+    approved_cells, paid_cells = worksheet.batch_get(ranges)
+
+    approved = [cells[0] if cells else "" for cells in approved_cells]
+    paid = [cells[0] if cells else "" for cells in paid_cells[:len(approved)]]
+    paid += [""] * (len(approved) - len(paid))
+
+    # Numericise like get_all_records, so typed 1/0 flags count by truth value
+    approved = numericise_all(approved, empty2zero=False, default_blank="")
+    paid = numericise_all(paid, empty2zero=False, default_blank="")
+
+    mask = (
+        normalize_boolean_column(pd.Series(approved, dtype=object)).to_numpy()
+        & ~normalize_boolean_column(pd.Series(paid, dtype=object)).to_numpy()
+    )
+    return np.flatnonzero(mask).tolist()
+
+
+def _load_worksheet(worksheet, columns: list[str]) -> tuple[pd.DataFrame, PaymentSheet]:
+    """
+    Load the payable rows of a worksheet, keeping only the given columns.
+
+    Consecutive payable rows are fetched as one range, all in a single
+    batch_get, and cell values are numericised like get_all_records does.
+
+    Args:
+        worksheet: Worksheet with a header row
+        columns: Column names to keep
+
+    Returns:
+        Tuple of (DataFrame of payable rows indexed by data row (sheet row minus 2),
+        sheet handle for marking rows as paid)
+    """
+    from gspread.utils import numericise_all
+
+    header = worksheet.row_values(1)
+    sheet = PaymentSheet(worksheet, header.index(COL_PAID) + 1)
+    kept = [column for column in header if column in columns]
+
+    rows = _find_payable_rows(worksheet, header)
+    if not rows:
+        return pd.DataFrame(columns=kept), sheet
+
+    runs = [
+        [row for _, row in group]
+        for _, group in itertools.groupby(enumerate(rows), key=lambda pair: pair[1] - pair[0])
+    ]
+    last_column = _column_letter(len(header))
+    ranges = [f"A{run[0] + 2}:{last_column}{run[-1] + 2}" for run in runs]
+
+    records = []
+    for run, values in zip(runs, worksheet.batch_get(ranges)):
+        values = list(values) + [[]] * (len(run) - len(values))
+        for cells in values:
+            cells = list(cells) + [""] * (len(header) - len(cells))
+            records.append(numericise_all(cells, empty2zero=False, default_blank=""))
+
+    frame = pd.DataFrame(records, columns=header, index=list(itertools.chain.from_iterable(runs)))
+    return frame[kept], sheet
+
+
+def mark_rows_as_paid(marks: Iterable[tuple[PaymentSheet, list[int]]]) -> None:
+    """
+    Mark loaded rows as paid in Google Sheets with a single batch update.
+
+    All worksheets must belong to the same spreadsheet; consecutive rows are
+    written as one range.
+
+    Args:
+        marks: Pairs of (sheet the rows were loaded from, DataFrame indices of the rows to mark)
+    """
+    from gspread.utils import absolute_range_name
+
+    spreadsheet = None
+    data = []
+    for sheet, row_indices in marks:
+        if not row_indices:
+            continue
+        spreadsheet = sheet.worksheet.spreadsheet
+
+        # Resolve the column letter once; row 1 is the header, data starts at row 2
+        column_letter = _column_letter(sheet.paid_column)
+        for _, group in itertools.groupby(
+            enumerate(sorted(row_indices)), key=lambda pair: pair[1] - pair[0]
+        ):
+            run = [row for _, row in group]
+            data.append({
+                "range": absolute_range_name(
+                    sheet.worksheet.title,
+                    f"{column_letter}{run[0] + 2}:{column_letter}{run[-1] + 2}",
+                ),
+                "values": [[True]] * len(run),
+            })
+
+    if data:
+        spreadsheet.values_batch_update(
+            body={"valueInputOption": "USER_ENTERED", "data": data}
+        )
+
+
+def _text_dtypes(columns: list[str]) -> dict[str, type]:
+    """Return read_csv dtypes reading every column but the flags as text."""
+    return {column: str for column in columns if column not in (COL_APPROVED, COL_PAID)}
+
+
 def load_data_from_csv(config: Config) -> tuple[pd.DataFrame, pd.DataFrame]:
     """
     Load data from CSV files.
@@ -40,7 +188,106 @@ def load_data_from_csv(config: Config) -> tuple[pd.DataFrame, pd.DataFrame]:
     Returns:
         Tuple of (expenses_df, invoices_df)
     """
-    expenses = pd.read_csv(config.expense_path)
-    invoices = pd.read_csv(config.invoice_path)
+    # Read only the columns in use, as text; parsing happens in normalize_dataframes
+    # and the row models, which also keeps account and OCR numbers intact. The
+    # flag columns keep pandas' inferred types so 1/0 cells count by truth value.
+    expenses = pd.read_csv(
+        config.expense_path,
+        usecols=lambda column: column in EXPENSE_COLUMNS,
+        dtype=_text_dtypes(EXPENSE_COLUMNS),
+    )
+    invoices = pd.read_csv(
+        config.invoice_path,
+        usecols=lambda column: column in INVOICE_COLUMNS,
+        dtype=_text_dtypes(INVOICE_COLUMNS),
+    )
     print("Data loaded from CSV files.")
     return expenses, invoices
+
+
+def normalize_boolean_column(series: pd.Series) -> pd.Series:
+    """
+    Convert a column of string/bool/numeric cells to booleans.
+
+    String cells are true when they read "true" (case-insensitive, ignoring
+    surrounding whitespace); all other cells use their Python truth value.
+
+    Args:
+        series: Column to normalize
+
+    Returns:
+        Boolean Series with the same index
+    """
+    if pd.api.types.is_bool_dtype(series) or pd.api.types.is_numeric_dtype(series):
+        return series.astype(bool)
+
+    # Homogeneous columns are handled in one pass. Missing cells would need the
+    # per-type split below: None is falsy while NaN is truthy.
+    if not series.hasnans:
+        inferred = pd.api.types.infer_dtype(series, skipna=False)
+        if inferred == "string":
+            # Flag columns hold a handful of distinct spellings: compare those
+            # once in a fixed-width numpy array and map back by code
+            codes, uniques = pd.factorize(series)
+            matches = np.char.lower(np.char.strip(np.asarray(uniques, dtype=str))) == "true"
+            return pd.Series(matches[codes], index=series.index)
+        if inferred == "boolean":
+            return series.astype(bool)
+
+    # Mixed columns: evaluate each distinct present value once, and missing
+    # cells by their own truth value
+    missing = series.isna()
+    codes, uniques = pd.factorize(series[~missing])
+    matches = np.array(
+        [
+            value.strip().lower() == "true" if isinstance(value, str) else bool(value)
+            for value in uniques
+        ],
+        dtype=bool,
+    )
+    normalized = pd.Series(False, index=series.index)
+    normalized[~missing] = matches[codes]
+    normalized[missing] = series[missing].astype(bool)
+    return normalized
+
+
+def amounts_to_ore(series: pd.Series) -> pd.Series:
+    """
+    Convert a column of SEK amounts to integer öre (1 SEK = 100 öre).
+
+    Accepts numbers and strings with either "," or "." as decimal separator.
+    Cells that cannot be parsed become missing values.
+
+    Args:
+        series: Column of amounts in SEK
+
+    Returns:
+        Nullable integer Series of amounts in öre
+    """
+    if not pd.api.types.is_numeric_dtype(series):
+        series = pd.to_numeric(
+            series.astype(str).str.strip().str.replace(",", ".", regex=False),
+            errors="coerce",
+        )
+    return (series.astype("float64") * 100).round().astype("Int64")
+
+
+def normalize_dataframes(
+    expenses: pd.DataFrame,
+    invoices: pd.DataFrame,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Normalize approval/paid flags and amounts of loaded expense and invoice data.
+
+    Args:
+        expenses: DataFrame with expenses
+        invoices: DataFrame with invoices
+
+    Returns:
+        Tuple of (expenses_df, invoices_df) with boolean flags and amounts in öre
+    """
+    for frame in (expenses, invoices):
+        frame[COL_APPROVED] = normalize_boolean_column(frame[COL_APPROVED])
+        frame[COL_PAID] = normalize_boolean_column(frame[COL_PAID])
+        frame[COL_AMOUNT] = amounts_to_ore(frame[COL_AMOUNT])
+    return expenses, invoices
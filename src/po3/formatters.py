@@ -2,6 +2,9 @@
 
 import datetime
 
+import numpy as np
+import pandas as pd
+
 from .constants import (
     CURRENCY,
     EXPENSE_CODE,
@@ -12,29 +15,59 @@ from .constants import (
     RECORD_TYPE_TRAILER,
 )
 
+# Fixed record segments, concatenated once at import time
+_MH00_PREFIX = RECORD_TYPE_HEADER + " " * 8
+_MH00_SUFFIX = CURRENCY + " " * 6 + CURRENCY + " " * 24
+_MT00_PREFIX = RECORD_TYPE_TRAILER + " " * 25
+_PI00_EXPENSE_PREFIX = RECORD_TYPE_PAYMENT + EXPENSE_CODE
+_BE01_PREFIX = RECORD_TYPE_BENEFICIARY + " " * 18
+
+_join_words = " ".join
+
 
-def format_amount(amount: float, length: int = 13) -> str:
+def payment_date() -> str:
+    """Return today's date as YYYYMMDD, the payment date of a PO3 run."""
+    return datetime.date.today().strftime("%Y%m%d")
+
+
+def format_amount(amount: int, length: int = 13) -> str:
     """
-    Format amount as öre (1 SEK = 100 öre), zero-padded.
+    Format amount in öre (1 SEK = 100 öre), zero-padded.
 
     Args:
-        amount: Amount in SEK
+        amount: Amount in öre
         length: Total length of output string
 
     Returns:
         Zero-padded string representation of amount in öre
     """
-    return str(round(amount * 100)).zfill(length)
+    return f"{amount:0{length}d}"
+
+
+def format_amount_column(amounts: pd.Series, length: int = 13) -> pd.Series:
+    """
+    Format a column of amounts in öre, zero-padded.
+
+    Args:
+        amounts: Amounts in öre
+        length: Total length of each output string
+
+    Returns:
+        Series of zero-padded amounts in öre
+    """
+    # NumPy converts and pads the fixed-width U array in C loops
+    padded = np.char.zfill(amounts.to_numpy(dtype="int64").astype(str), length)
+    return pd.Series(padded, index=amounts.index, dtype=object)
 
 
 def create_note(activity: str, description: str, name: str) -> str:
     """Create standardized note from transaction details."""
-    return f"{activity} {description} {name}"
+    return _join_words((activity, description, name))
 
 
 def create_message(activity: str, description: str) -> str:
     """Create standardized message from transaction details."""
-    return f"{activity} {description}"
+    return _join_words((activity, description))
 
 
 # ============================================================================
@@ -53,128 +86,124 @@ def generate_start_line(org_number: str, account_number: str) -> str:
     Returns:
         Formatted header line
     """
-    return (
-        RECORD_TYPE_HEADER
-        + " " * 8
-        + org_number
-        + " " * 12
-        + account_number.ljust(10)
-        + CURRENCY
-        + " " * 6
-        + CURRENCY
-        + " " * 24
-    )
+    return f"{_MH00_PREFIX}{org_number}{' ' * 12}{account_number:<10}{_MH00_SUFFIX}"
 
 
-def generate_end_line(number_of_rows: int, total_cost: float) -> str:
+def generate_end_line(number_of_rows: int, total_cost: int) -> str:
     """
     Generate MT00 trailer line for PO3 file.
 
     Args:
         number_of_rows: Total number of payment records
-        total_cost: Total amount in SEK
+        total_cost: Total amount in öre
 
     Returns:
         Formatted trailer line
     """
-    return (
-        RECORD_TYPE_TRAILER
-        + " " * 25
-        + str(number_of_rows).zfill(7)
-        + format_amount(total_cost, 15)
-        + " " * 29
-    )
+    return f"{_MT00_PREFIX}{number_of_rows:07d}{format_amount(total_cost, 15)}{' ' * 29}"
 
 
-def generate_pi00_expense(
-    clearing_number: int,
-    account_number: int,
-    amount: float,
-    message: str
-) -> str:
+# ============================================================================
+# VECTORIZED PO3 FORMAT GENERATORS
+# ============================================================================
+
+
+def generate_pi00_expense_column(
+    clearing_numbers: pd.Series,
+    account_numbers: pd.Series,
+    amounts: pd.Series,
+    messages: pd.Series,
+    today: str | None = None,
+) -> pd.Series:
     """
-    Generate PI00 payment line for bank account expense.
+    Generate PI00 payment lines for a column of bank account expenses.
 
     Args:
-        clearing_number: Bank clearing number
-        account_number: Bank account number
-        amount: Amount in SEK
-        message: Payment message
+        clearing_numbers: Bank clearing numbers
+        account_numbers: Bank account numbers
+        amounts: Amounts in öre
+        messages: Payment messages
+        today: Payment date as YYYYMMDD, defaults to today
 
     Returns:
-        Formatted payment line
+        Series of formatted payment lines
     """
+    today = today or payment_date()
     return (
-        RECORD_TYPE_PAYMENT
-        + EXPENSE_CODE
-        + str(clearing_number).ljust(5)
-        + str(account_number).ljust(11)
+        _PI00_EXPENSE_PREFIX
+        + clearing_numbers.astype(str).str.ljust(5)
+        + account_numbers.astype(str).str.ljust(11)
         + "  "
-        + datetime.datetime.now().strftime("%Y%m%d")
-        + format_amount(amount)
-        + message.ljust(12)[:12]
+        + today
+        + format_amount_column(amounts)
+        + messages.str.ljust(12).str.slice(0, 12)
         + " " * 23
     )
 
 
-def generate_pi00_giro(
-    account_number: int,
-    amount: float,
-    ocr: str,
-    giro_code: str,
-) -> str:
+def generate_pi00_giro_column(
+    account_numbers: pd.Series,
+    amounts: pd.Series,
+    ocrs: pd.Series,
+    giro_codes: pd.Series,
+    today: str | None = None,
+) -> pd.Series:
     """
-    Generate PI00 payment line for giro payment (Plusgiro/Bankgiro).
+    Generate PI00 payment lines for a column of giro payments.
 
     Args:
-        account_number: Giro account number
-        amount: Amount in SEK
-        ocr: OCR number or message
-        giro_code: "00" for Plusgiro, "05" for Bankgiro
+        account_numbers: Giro account numbers
+        amounts: Amounts in öre
+        ocrs: OCR numbers or messages
+        giro_codes: "00" for Plusgiro, "05" for Bankgiro
+        today: Payment date as YYYYMMDD, defaults to today
 
     Returns:
-        Formatted payment line
+        Series of formatted payment lines
     """
+    today = today or payment_date()
     return (
         RECORD_TYPE_PAYMENT
-        + giro_code
+        + giro_codes
         + " " * 5
-        + str(account_number).ljust(11)
+        + account_numbers.astype(str).str.ljust(11)
         + "  "
-        + datetime.date.today().strftime("%Y%m%d")
-        + format_amount(amount)
-        + str(ocr).ljust(25)
+        + today
+        + format_amount_column(amounts)
+        + ocrs.astype(str).str.ljust(25)
         + " " * 10
     )
 
 
-def generate_ba00(note: str) -> str:
+def generate_ba00_column(notes: pd.Series) -> pd.Series:
     """
-    Generate BA00 note line.
+    Generate BA00 note lines for a column of notes.
 
     Args:
-        note: Note text
+        notes: Note texts
 
     Returns:
-        Formatted note line
+        Series of formatted note lines
     """
     return (
         RECORD_TYPE_NOTE
-        + note.ljust(18)[:18]
+        + notes.str.ljust(18).str.slice(0, 18)
         + " " * 9
-        + note.ljust(35)[:35]
+        + notes.str.ljust(35).str.slice(0, 35)
         + " " * 14
     )
 
 
-def generate_be01(recipient: str) -> str:
+def generate_be01_column(recipients: pd.Series) -> pd.Series:
     """
-    Generate BE01 beneficiary line.
+    Generate BE01 beneficiary lines for a column of recipients.
+
+    A categorical column is padded once per category rather than once per row.
 
     Args:
-        recipient: Recipient name
+        recipients: Recipient names
 
     Returns:
-        Formatted beneficiary line
+        Series of formatted beneficiary lines
     """
-    return RECORD_TYPE_BENEFICIARY + " " * 18 + recipient.ljust(58)
+    return _BE01_PREFIX + recipients.str.ljust(58)
@@ -1,32 +1,46 @@
 """Pydantic models for expense and invoice data."""
 
+import functools
 from datetime import date, datetime
 from typing import Literal
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 
+@functools.lru_cache(maxsize=32)
+def _parse_boolean_str(value: str) -> bool:
+    """Parse a boolean cell string; sheets use only a few spellings."""
+    return value.strip().lower() == "true"
+
+
 def _parse_boolean(value):
     """Parse boolean from various formats (string, bool, int)."""
-    if isinstance(value, bool):
+    # Loaded frames already hold normalized bools; an exact type check returns them first
+    value_type = type(value)
+    if value_type is bool:
         return value
     if isinstance(value, str):
-        return value.strip().lower() == "true"
+        return _parse_boolean_str(value)
     return bool(value)
 
 
-class ExpenseRow(BaseModel):
-    """Model for expense data rows from CSV."""
+def _blank_to_none(value):
+    """Treat blank attachment cells as missing values."""
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
 
-    model_config = ConfigDict(extra="allow", populate_by_name=True)
+class _PaymentRow(BaseModel):
+    """Fields shared by expense and invoice rows."""
+
+    model_config = ConfigDict(extra="ignore", populate_by_name=True, frozen=True)
 
     Godkänt: bool
     Utbetalt: bool
-    Belopp: float
+    Belopp: int  # öre
     Verksamhet: str
-    Clearingnummer: int
-    Kontonummer: int
-    kvitto_url: str | None = Field(default=None, alias="Ladda upp bild på kvitto")
     Ditt_namn: str = Field(alias="Ditt namn")
     Kort_beskrivning_av_köp: str = Field(alias="Kort beskrivning av köp")
 
@@ -36,48 +50,31 @@ class ExpenseRow(BaseModel):
         """Parse boolean fields from various formats."""
         return _parse_boolean(v)
 
+
+class ExpenseRow(_PaymentRow):
+    """Model for expense data rows from CSV."""
+
+    Clearingnummer: int
+    Kontonummer: int
+    kvitto_url: str | None = Field(default=None, alias="Ladda upp bild på kvitto")
+
     @field_validator("kvitto_url", mode="before")
     @classmethod
     def normalize_kvitto_url(cls, v):
         """Treat blank attachment cells as missing values."""
-        if v is None:
-            return None
-        value = str(v).strip()
-        return value or None
+        return _blank_to_none(v)
 
 
-class InvoiceRow(BaseModel):
+class InvoiceRow(_PaymentRow):
     """Model for invoice data rows from CSV."""
 
-    model_config = ConfigDict(extra="allow", populate_by_name=True)
-
-    Godkänt: bool
-    Utbetalt: bool
-    Belopp: float
-    Verksamhet: str
     faktura_url: str | None = Field(default=None, alias="Ladda upp fakturan")
     Mottagarkontotyp: Literal["Plusgiro", "Bankgiro"]
     Mottagarkontonummer: int
     OCR_meddelande: str = Field(alias="OCR/meddelande")
-    Ditt_namn: str = Field(alias="Ditt namn")
-    Kort_beskrivning_av_köp: str = Field(alias="Kort beskrivning av köp")
     Mottagare_namn: str = Field(alias="Mottagare (namn)")
     Payment_date: date = Field(alias="Sista betalningsdatum")
 
-    @field_validator("Godkänt", "Utbetalt", mode="before")
-    @classmethod
-    def parse_booleans(cls, v):
-        """Parse boolean fields from various formats."""
-        return _parse_boolean(v)
-
-    @field_validator("Belopp", mode="before")
-    @classmethod
-    def parse_amount(cls, v):
-        """Parse amount field as float."""
-        if isinstance(v, (int, float)):
-            return float(v)
-        return float(str(v).replace(",", "."))
-
     @field_validator("OCR_meddelande", mode="before")
     @classmethod
     def make_str(cls, v):
@@ -88,10 +85,7 @@ class InvoiceRow(BaseModel):
     @classmethod
     def normalize_faktura_url(cls, v):
         """Treat blank attachment cells as missing values."""
-        if v is None:
-            return None
-        value = str(v).strip()
-        return value or None
+        return _blank_to_none(v)
 
     @field_validator("Payment_date", mode="before")
     @classmethod
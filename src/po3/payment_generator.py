@@ -1,69 +1,116 @@
 """Payment line generation for expenses and invoices."""
 
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
 from .constants import (
     BANKGIRO_CODE,
     PLUSGIRO_CODE,
 )
 from .formatters import (
-    create_message,
-    create_note,
-    generate_ba00,
-    generate_be01,
-    generate_pi00_expense,
-    generate_pi00_giro,
+    generate_ba00_column,
+    generate_be01_column,
+    generate_pi00_expense_column,
+    generate_pi00_giro_column,
 )
 from .models import ExpenseRow, InvoiceRow
 
 
-def generate_lines_for_expense(expense: ExpenseRow) -> list[str]:
+def _interleave(*columns: pd.Series) -> list[str]:
+    """Flatten line columns row by row, keeping each payment's lines together."""
+    return np.stack([column.to_numpy() for column in columns], axis=1).ravel().tolist()
+
+
+def generate_lines_for_expenses(
+    expenses: Sequence[ExpenseRow], today: str | None = None
+) -> list[str]:
     """
-    Generate PO3 lines for a single expense (bank account payment).
+    Generate PO3 lines for a batch of expenses, one column operation per field.
 
     Args:
-        expense: Validated expense row model
+        expenses: Validated expense row models
+        today: Payment date as YYYYMMDD, defaults to today
 
     Returns:
-        List of formatted lines
+        List of formatted lines, three per expense in input order
     """
-    lines = []
-    message = create_message(expense.Verksamhet, expense.Kort_beskrivning_av_köp)
-
-    lines.append(generate_pi00_expense(
-        expense.Clearingnummer,
-        expense.Kontonummer,
-        expense.Belopp,
-        message
-    ))
+    if not expenses:
+        return []
 
-    note = create_note(expense.Verksamhet, expense.Kort_beskrivning_av_köp, expense.Ditt_namn)
-    lines.append(generate_ba00(note))
-    lines.append(generate_be01(expense.Ditt_namn))
+    frame = pd.DataFrame(
+        [
+            (
+                expense.Clearingnummer,
+                expense.Kontonummer,
+                expense.Belopp,
+                expense.Verksamhet,
+                expense.Kort_beskrivning_av_köp,
+                expense.Ditt_namn,
+            )
+            for expense in expenses
+        ],
+        columns=["clearing", "account", "amount", "activity", "description", "name"],
+    )
+    message = frame["activity"] + " " + frame["description"]
+    note = message + " " + frame["name"]
 
-    return lines
+    return _interleave(
+        generate_pi00_expense_column(
+            frame["clearing"], frame["account"], frame["amount"], message, today
+        ),
+        generate_ba00_column(note),
+        # Names repeat across payments, so pad each distinct name only once
+        generate_be01_column(frame["name"].astype("category")),
+    )
 
 
-def generate_lines_for_invoice(invoice: InvoiceRow) -> list[str]:
+def generate_lines_for_invoices(
+    invoices: Sequence[InvoiceRow], today: str | None = None
+) -> list[str]:
     """
-    Generate PO3 lines for a single invoice (giro payment).
+    Generate PO3 lines for a batch of invoices, one column operation per field.
 
     Args:
-        invoice: Validated invoice row model
+        invoices: Validated invoice row models
+        today: Payment date as YYYYMMDD, defaults to today
 
     Returns:
-        List of formatted lines
+        List of formatted lines, three per invoice in input order
     """
-    lines = []
-    giro_code = PLUSGIRO_CODE if invoice.Mottagarkontotyp == "Plusgiro" else BANKGIRO_CODE
-
-    lines.append(generate_pi00_giro(
-        invoice.Mottagarkontonummer,
-        invoice.Belopp,
-        invoice.OCR_meddelande,
-        giro_code,
-    ))
+    if not invoices:
+        return []
 
-    note = create_note(invoice.Verksamhet, invoice.Kort_beskrivning_av_köp, invoice.Ditt_namn)
-    lines.append(generate_ba00(note))
-    lines.append(generate_be01(invoice.Mottagare_namn))
+    frame = pd.DataFrame(
+        [
+            (
+                invoice.Mottagarkontotyp,
+                invoice.Mottagarkontonummer,
+                invoice.Belopp,
+                invoice.OCR_meddelande,
+                invoice.Verksamhet,
+                invoice.Kort_beskrivning_av_köp,
+                invoice.Ditt_namn,
+                invoice.Mottagare_namn,
+            )
+            for invoice in invoices
+        ],
+        columns=[
+            "account_type", "account", "amount", "ocr",
+            "activity", "description", "name", "recipient",
+        ],
+    )
+    giro_code = pd.Series(
+        np.where(frame["account_type"] == "Plusgiro", PLUSGIRO_CODE, BANKGIRO_CODE),
+        index=frame.index,
+    )
+    note = frame["activity"] + " " + frame["description"] + " " + frame["name"]
 
-    return lines
+    return _interleave(
+        generate_pi00_giro_column(
+            frame["account"], frame["amount"], frame["ocr"], giro_code, today
+        ),
+        generate_ba00_column(note),
+        generate_be01_column(frame["recipient"].astype("category")),
+    )
@@ -1,47 +1,107 @@
 """Validation functions for expense and invoice data."""
 
-from typing import Optional
+from typing import Any, Mapping, Optional, TypeVar
 
+import numpy as np
 import pandas as pd
 
+from .constants import COL_APPROVED, COL_PAID
 from .models import ExpenseRow, InvoiceRow
 
+_RowT = TypeVar("_RowT", ExpenseRow, InvoiceRow)
 
-def validate_expense(row: pd.Series) -> Optional[ExpenseRow]:
+
+def payable_mask(frame: pd.DataFrame) -> np.ndarray:
     """
-    Validate and convert an expense row to Pydantic model.
+    Flag rows that are approved and not yet paid, in one vectorized pass.
+
+    Both flag columns must already be normalized to booleans. Rows passing
+    this check still need validate_expense/validate_invoice for field checks.
 
     Args:
-        row: DataFrame row (Series)
+        frame: DataFrame with expenses or invoices
 
     Returns:
-        ExpenseRow object if valid, None otherwise
+        Boolean numpy array, True for rows to pay
     """
+    return frame[COL_APPROVED].to_numpy(dtype=bool) & ~frame[COL_PAID].to_numpy(dtype=bool)
+
+
+def _validate_row(model: type[_RowT], row: Mapping[str, Any], kind: str) -> Optional[_RowT]:
+    """Build a row model, returning None for unapproved or invalid rows."""
     try:
-        expense = ExpenseRow(**row.to_dict())
-        if not expense.Godkänt:
+        validated = model.model_validate(row)
+        if not validated.Godkänt:
             return None
-        return expense
+        return validated
     except Exception as e:
-        print(f"Warning: Failed to validate expense row - {e}")
+        print(f"Warning: Failed to validate {kind} row - {e}")
         return None
 
 
-def validate_invoice(row: pd.Series) -> Optional[InvoiceRow]:
+def validate_expense(row: Mapping[str, Any]) -> Optional[ExpenseRow]:
+    """
+    Validate and convert an expense row to Pydantic model.
+
+    Args:
+        row: Mapping of column name to cell value
+
+    Returns:
+        ExpenseRow object if valid, None otherwise
+    """
+    return _validate_row(ExpenseRow, row, "expense")
+
+
+def validate_invoice(row: Mapping[str, Any]) -> Optional[InvoiceRow]:
     """
     Validate and convert an invoice row to Pydantic model.
 
     Args:
-        row: DataFrame row (Series)
+        row: Mapping of column name to cell value
 
     Returns:
         InvoiceRow object if valid, None otherwise
     """
-    try:
-        invoice = InvoiceRow(**row.to_dict())
-        if not invoice.Godkänt:
-            return None
-        return invoice
-    except Exception as e:
-        print(f"Warning: Failed to validate invoice row - {e}")
-        return None
+    return _validate_row(InvoiceRow, row, "invoice")
+
+
+def _validate_frame(
+    model: type[_RowT], frame: pd.DataFrame, kind: str
+) -> list[tuple[Any, _RowT]]:
+    """Validate the payable rows of a frame, keeping each row's index."""
+    mask = payable_mask(frame)
+    if not mask.all():
+        frame = frame[mask]
+
+    validated = []
+    for index, row in zip(frame.index, frame.to_dict(orient="records")):
+        row_model = _validate_row(model, row, kind)
+        if row_model:
+            validated.append((index, row_model))
+    return validated
+
+
+def validate_expense_dataframe(frame: pd.DataFrame) -> list[tuple[Any, ExpenseRow]]:
+    """
+    Validate the approved, unpaid rows of an expense DataFrame.
+
+    Args:
+        frame: DataFrame with normalized expenses
+
+    Returns:
+        List of (DataFrame index, ExpenseRow) pairs for valid rows, in frame order
+    """
+    return _validate_frame(ExpenseRow, frame, "expense")
+
+
+def validate_invoice_dataframe(frame: pd.DataFrame) -> list[tuple[Any, InvoiceRow]]:
+    """
+    Validate the approved, unpaid rows of an invoice DataFrame.
+
+    Args:
+        frame: DataFrame with normalized invoices
+
+    Returns:
+        List of (DataFrame index, InvoiceRow) pairs for valid rows, in frame order
+    """
+    return _validate_frame(InvoiceRow, frame, "invoice")